@@ -6,7 +6,8 @@ from reportlab.pdfgen import canvas
 from backend.pdf_loader import load_pdf_text
 from backend.vector_store import create_vector_store, load_vector_store
 from backend.qa_chain import ask_question
-from backend.quiz_generator import generate_mcq_quiz, parse_mcq_output
+from backend.quiz_generator import stream_mcq_quiz
+from backend.llm_parser import MCQStreamParser
 import google_forms
 from backend.youtube_recommender import recommend_videos
 
@@ -139,14 +140,24 @@ def show_quiz_page():
         db = load_vector_store(DB_PATH)
         docs = db.similarity_search("generate quiz", k=5)
         ctx = "\n\n".join([d.page_content for d in docs])
-        quiz_text = generate_mcq_quiz(ctx, difficulty=difficulty, num_questions=num_q)
-        st.session_state.quiz_state = {
-            "questions": parse_mcq_output(quiz_text),
-            "submitted": [False]*num_q,
-            "feedback": [""]*num_q,
-            "score": 0
-        }
-        st.rerun()
+        parser = MCQStreamParser()
+        questions = []
+        progress = st.empty()
+        for q in stream_mcq_quiz(ctx, difficulty=difficulty, num_questions=num_q, parser=parser):
+            questions.append(q)
+            progress.info(f"⏳ Generated {len(questions)}/{num_q} questions...")
+        progress.empty()
+        if not questions:
+            st.session_state.quiz_state = {}
+            st.error(f"❌ Couldn't read any questions from the generated quiz ({len(parser.rejected)} rejected). Please try again.")
+        else:
+            st.session_state.quiz_state = {
+                "questions": questions,
+                "submitted": [False]*len(questions),
+                "feedback": [""]*len(questions),
+                "score": 0
+            }
+            st.rerun()
     if "questions" in st.session_state.quiz_state:
         render_quiz()
 
@@ -0,0 +1,419 @@
+"""
+Parsers for Gemini quiz and form output.
+
+Both parsers work incrementally: feed() them text as it streams in and they
+return every question that is complete so far, close() flushes the rest.
+Instead of dropping a question whenever the output drifts from the
+requested format, they accept the common variations (markdown bold,
+"A)" / "(A)" options, any number of options, a missing explanation) and
+recover what is complete from JSON that was cut off mid-item. Questions
+that still cannot be used end up in the parser's rejected list.
+"""
+
+import json
+import re
+
+# ============================= MCQ TEXT =============================
+# One alternation, tried in order, so each line costs a single match call
+_MCQ_LINE = re.compile(
+    r"(?i:(?:q(?:uestion)?\s*(?P<qnumber>\d+)\s*[.):-]?|(?P<number>\d+)\s*[.)])\s*(?P<question>.*))"
+    r"|(?i:(?:correct\s+)?(?:answer|ans)\s*[:\-]\s*(?P<answer>.*))"
+    r"|(?i:(?:explanation|reason|rationale)\s*[:\-]\s*(?P<explanation>.*))"
+    # Lowercase "a)" options need a space after them so "e.g." is not option E
+    r"|[-*]?\s*\(?(?:(?P<letter>[A-H])\s*[.):]|(?P<lower>[a-h])\s*[.):](?!\S))\s*(?P<option>.*)"
+)
+_ANSWER_ONLY_LETTER = re.compile(r"^\(?([A-Ha-h])\)?\.?$")
+_ANSWER_LETTER = re.compile(r"^\(?([A-Ha-h])[.):]")
+
+
+def _clean_line(line):
+    return line.replace("**", "").strip().lstrip("#").strip()
+
+
+def _resolve_answer(raw, options):
+    """Maps 'B', 'b.', '(B)', 'B) text' or the option text itself to an option letter."""
+    raw = raw.strip()
+    if not raw:
+        return None
+    # A bare letter is the option letter, even if some option's text is "B"
+    match = _ANSWER_ONLY_LETTER.match(raw)
+    if match and match.group(1).upper() in options:
+        return match.group(1).upper()
+    lowered = raw.lower()
+    for key, value in options.items():
+        if value.lower() == lowered:
+            return key
+    match = _ANSWER_LETTER.match(raw)
+    if match and match.group(1).upper() in options:
+        return match.group(1).upper()
+    return None
+
+
+class MCQStreamParser:
+    """
+    Line-oriented, single-pass parser for the 'Q1. / A. / Answer: /
+    Explanation:' quiz format. Questions that cannot be used (no answer
+    or fewer than two options) are kept in self.rejected.
+    """
+
+    def __init__(self):
+        self.rejected = []
+        self._buffer = ""
+        self._current = None
+        self._field = None
+        self._last_option = None
+        self._number = 0
+        self._numbered_list = False
+
+    def feed(self, chunk):
+        lines = (self._buffer + chunk).split("\n")
+        self._buffer = lines.pop()
+        questions = []
+        for line in lines:
+            done = self._parse_line(line)
+            if done:
+                questions.append(done)
+        return questions
+
+    def close(self):
+        questions = self.feed("\n")
+        done = self._finish()
+        if done:
+            questions.append(done)
+        return questions
+
+    def _parse_line(self, line):
+        line = _clean_line(line)
+        if not line:
+            return None
+
+        match = _MCQ_LINE.fullmatch(line)
+        kind = match.lastgroup if match else None
+        if kind == "question" and match.group("number"):
+            # An unprefixed "1." / "1)" starts the next question only after the
+            # open one has its answer; otherwise it is a list inside the stem,
+            # an option or the explanation (e.g. items to put in order)
+            number = int(match.group("number"))
+            answered = self._current is None or self._current["answer"]
+            if not answered or number != self._number + 1 or self._numbered_list:
+                self._numbered_list = True
+                kind = None
+        if kind == "question":
+            done = self._finish()
+            self._number = int(match.group("qnumber") or match.group("number"))
+            self._current = {"question": match.group("question").strip(), "options": {}, "answer": "", "explanation": ""}
+            self._field = "question"
+            return done
+
+        current = self._current
+        if current is None:
+            # Preamble before the first question
+            return None
+
+        if kind == "answer":
+            current["answer"] = match.group("answer")
+            self._field = "answer"
+            self._numbered_list = False
+            return None
+        if kind == "explanation":
+            current["explanation"] = match.group("explanation").strip()
+            self._field = "explanation"
+            self._numbered_list = False
+            return None
+        if kind == "option" and self._field in ("question", "option"):
+            letter = (match.group("letter") or match.group("lower")).upper()
+            current["options"][letter] = match.group("option").strip()
+            self._last_option = letter
+            self._field = "option"
+            self._numbered_list = False
+            return None
+
+        # Continuation of a value that wrapped onto the next line
+        if self._field == "question":
+            current["question"] = f"{current['question']} {line}".strip()
+        elif self._field == "option":
+            current["options"][self._last_option] += " " + line
+        elif self._field == "explanation":
+            current["explanation"] = f"{current['explanation']} {line}".strip()
+        return None
+
+    def _finish(self):
+        current, self._current, self._field = self._current, None, None
+        self._numbered_list = False
+        if current is None:
+            return None
+        answer = _resolve_answer(current["answer"], current["options"])
+        if not current["question"] or len(current["options"]) < 2 or answer is None:
+            self.rejected.append(current)
+            return None
+        current["answer"] = answer
+        return current
+
+
+def parse_mcq_text(text):
+    parser = MCQStreamParser()
+    return parser.feed(text) + parser.close()
+
+
+def parse_mcq_stream(chunks, parser=None):
+    """
+    Yields each question as soon as the chunks that complete it arrive.
+    Pass a parser to read its rejected list afterwards.
+    """
+    parser = parser or MCQStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+# ============================= JSON QUESTIONS =============================
+# response_schema for Gemini structured output, matching what
+# google_forms.create_form and download_responses read.
+QUESTIONS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "questions": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "question": {"type": "STRING"},
+                    "options": {"type": "ARRAY", "items": {"type": "STRING"}},
+                    "answer": {"type": "STRING"},
+                },
+                "required": ["question", "answer"],
+            },
+        }
+    },
+    "required": ["questions"],
+}
+
+_STRUCTURE = re.compile(r'[{}\[\]"]')
+_STRING_END = re.compile(r'["\\]')
+_JSON_START = re.compile(r"[{\[]")
+_OPTION_LETTER = re.compile(r"^\(?([A-Ha-h])(?:[.):]|$)")
+_decoder = json.JSONDecoder()
+
+
+def normalize_question(item):
+    """
+    Coerces one decoded item to {"question", "options", "answer"}.
+    Returns None only when there is no question text to keep.
+    """
+    if not isinstance(item, dict):
+        return None
+    question = str(item.get("question") or "").strip()
+    if not question:
+        return None
+
+    options = item.get("options") or []
+    if isinstance(options, dict):
+        options = list(options.values())
+    if not isinstance(options, list):
+        options = []
+    options = [str(opt).strip() for opt in options if str(opt).strip()]
+
+    answer = str(item.get("answer") or "").strip()
+    if options and answer not in options:
+        # "B" or "B." instead of the option text
+        match = _OPTION_LETTER.match(answer)
+        if match and ord(match.group(1).upper()) - ord("A") < len(options):
+            answer = options[ord(match.group(1).upper()) - ord("A")]
+
+    return {"question": question, "options": options, "answer": answer}
+
+
+def is_usable_question(question, mcq=True):
+    """
+    A form question needs an answer to score against; an MCQ also needs at
+    least two options, one of which is the answer.
+    """
+    if not question["answer"]:
+        return False
+    if mcq:
+        return len(question["options"]) >= 2 and question["answer"] in question["options"]
+    return True
+
+
+def repair_json(fragment):
+    """
+    Closes a truncated JSON fragment so it decodes. Anything unfinished (a
+    half-written string, a dangling key, a half-written number) is cut back
+    to the last complete value, so no partial text is ever kept.
+    """
+    stack = []
+    in_string = escape = is_value = False
+    prev = ""
+    cut, cut_stack = 0, []
+
+    for i, ch in enumerate(fragment):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+                if is_value:
+                    cut, cut_stack = i + 1, list(stack)
+                prev = ch
+            continue
+        if ch == '"':
+            in_string = True
+            is_value = prev == ":" or (bool(stack) and stack[-1] == "[" and prev in "[,")
+        elif ch in "{[":
+            stack.append(ch)
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            cut, cut_stack = i + 1, list(stack)
+        elif ch == ",":
+            cut, cut_stack = i, list(stack)
+        if not ch.isspace():
+            prev = ch
+
+    closers = "".join("}" if b == "{" else "]" for b in reversed(cut_stack))
+    try:
+        return json.loads(fragment[:cut] + closers)
+    except ValueError:
+        return None
+
+
+class JSONQuestionStreamParser:
+    """
+    Incremental scanner for {"questions": [...]} output (or a bare list).
+    Every object that closes directly inside an array is decoded and
+    returned from feed() straight away; close() repairs a final item that
+    was cut off. Prose or markdown fences around the JSON are skipped.
+    Items that fail is_usable_question(mcq) are kept in self.rejected.
+    """
+
+    def __init__(self, mcq=True):
+        self.mcq = mcq
+        self.rejected = []
+        self._text = ""
+        self._pos = 0
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._item_start = None
+        self._item_depth = 0
+
+    def feed(self, chunk):
+        self._text += chunk
+        text = self._text
+        pos = self._pos
+        questions = []
+
+        while pos < len(text):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    pos += 1
+                    continue
+                match = _STRING_END.search(text, pos)
+                if not match:
+                    pos = len(text)
+                    break
+                pos = match.end()
+                if match.group() == "\\":
+                    self._escape = True
+                else:
+                    self._in_string = False
+                continue
+
+            match = _STRUCTURE.search(text, pos)
+            if not match:
+                pos = len(text)
+                break
+            ch, idx = match.group(), match.start()
+            pos = match.end()
+
+            if ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                if self._item_start is None and self._stack and self._stack[-1] == "[":
+                    self._item_start, self._item_depth = idx, len(self._stack)
+                self._stack.append(ch)
+            elif ch == "[":
+                self._stack.append(ch)
+            elif self._stack:
+                self._stack.pop()
+                if ch == "}" and self._item_start is not None and len(self._stack) == self._item_depth:
+                    raw = text[self._item_start:pos]
+                    try:
+                        question = self.accept(json.loads(raw))
+                    except ValueError:
+                        self.rejected.append(raw)
+                        question = None
+                    if question:
+                        questions.append(question)
+                    self._item_start = None
+
+        # Only keep text that an unfinished item still needs
+        keep_from = self._item_start if self._item_start is not None else pos
+        self._text = text[keep_from:]
+        self._pos = pos - keep_from
+        if self._item_start is not None:
+            self._item_start = 0
+        return questions
+
+    def accept(self, item):
+        """Returns the normalized question, or None after recording it in rejected."""
+        question = normalize_question(item)
+        if question is None or not is_usable_question(question, self.mcq):
+            self.rejected.append(item)
+            return None
+        return question
+
+    def close(self):
+        if self._item_start is None:
+            return []
+        fragment = self._text[self._item_start:]
+        self._item_start = None
+        repaired = repair_json(fragment)
+        question = self.accept(repaired if repaired is not None else fragment)
+        return [question] if question else []
+
+
+def parse_json_questions(text, mcq=True):
+    """
+    Well-formed JSON is decoded in one call; anything else goes through
+    JSONQuestionStreamParser. JSON-looking prose before the payload, such
+    as "[2]", is skipped. Set mcq=False for Blanks/Mixed forms, whose
+    questions need no options.
+    """
+    parser = JSONQuestionStreamParser(mcq)
+    items = None
+    start = _JSON_START.search(text)
+    while start:
+        try:
+            data, end = _decoder.raw_decode(text, start.start())
+        except ValueError:
+            # Invalid or truncated from here on: let the stream parser recover it
+            break
+        if isinstance(data, dict) and isinstance(data.get("questions"), list):
+            items = data["questions"]
+            break
+        if isinstance(data, list) and data and all(isinstance(item, dict) for item in data):
+            items = data
+            break
+        # Not the payload; keep looking after it
+        start = _JSON_START.search(text, end)
+
+    if isinstance(items, list):
+        questions = [q for q in map(parser.accept, items) if q]
+    else:
+        questions = parser.feed(text) + parser.close()
+    return {"questions": questions, "rejected": parser.rejected}
+
+
+def parse_json_stream(chunks, parser=None):
+    """
+    Yields each question as soon as its JSON object has been streamed.
+    Pass a parser to read its rejected list afterwards.
+    """
+    parser = parser or JSONQuestionStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
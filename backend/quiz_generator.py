@@ -2,9 +2,10 @@
 
 import google.generativeai as genai
 import os
-import re
 from dotenv import load_dotenv
 
+from backend.llm_parser import parse_mcq_stream, parse_mcq_text
+
 # Load environment variables
 load_dotenv()
 
@@ -19,11 +20,8 @@ genai.configure(api_key=GEMINI_API_KEY)
 # Initialize the model
 model = genai.GenerativeModel("gemini-1.5-flash")
 
-def generate_mcq_quiz(context, difficulty="basic", num_questions=5):
-    """
-    Generates MCQs from given context using Gemini.
-    """
-    prompt = f"""
+def build_quiz_prompt(context, difficulty="basic", num_questions=5):
+    return f"""
 You are a quiz master. Generate a {difficulty}-level MCQ quiz based on the following content.
 
 Context:
@@ -40,48 +38,28 @@ D. Option D
 Answer: A/B/C/D
 Explanation: One-line explanation
 """
-    response = model.generate_content(prompt)
+
+def generate_mcq_quiz(context, difficulty="basic", num_questions=5):
+    """
+    Generates MCQs from given context using Gemini.
+    """
+    response = model.generate_content(build_quiz_prompt(context, difficulty, num_questions))
     return response.text.strip()
 
+def stream_mcq_quiz(context, difficulty="basic", num_questions=5, parser=None):
+    """
+    Streams the quiz from Gemini and yields each parsed question as soon as
+    it is complete, instead of waiting for the whole response. Pass an
+    MCQStreamParser to read its rejected list afterwards.
+    """
+    response = model.generate_content(build_quiz_prompt(context, difficulty, num_questions), stream=True)
+    yield from parse_mcq_stream((chunk.text for chunk in response), parser)
+
 def parse_mcq_output(quiz_text):
     """
     Parses Gemini-generated quiz text into structured question dictionaries.
     Returns a list of questions with text, options, answer, and explanation.
+    Format drift (markdown, "A)" options, missing explanation) is tolerated;
+    see backend/llm_parser.py.
     """
-    questions = []
-
-    # Split on lines starting with Q + number + dot (e.g. Q1.)
-    blocks = re.split(r"\nQ\d+\.", "\n" + quiz_text.strip())
-    for block in blocks:
-        block = block.strip()
-        if not block:
-            continue
-
-        lines = block.splitlines()
-        if len(lines) < 5:
-            # Not enough lines to parse a question
-            continue
-
-        q_line = lines[0].strip()
-
-        # Parse options safely
-        options = {}
-        for line in lines[1:5]:
-            match = re.match(r"([A-D])\.\s*(.*)", line.strip())
-            if match:
-                options[match.group(1)] = match.group(2).strip()
-
-        # Find answer and explanation
-        answer_match = re.search(r"Answer:\s*([A-D])", block)
-        explanation_match = re.search(r"Explanation:\s*(.*)", block)
-
-        if answer_match and explanation_match and options:
-            question_data = {
-                "question": q_line,
-                "options": options,
-                "answer": answer_match.group(1).strip(),
-                "explanation": explanation_match.group(1).strip()
-            }
-            questions.append(question_data)
-
-    return questions
+    return parse_mcq_text(quiz_text)
@@ -0,0 +1,91 @@
+"""
+Synthetic study documents for the benchmarks, from 1 to 1000 pages.
+Output is deterministic for a given (pages, seed) so results are comparable
+between commits.
+"""
+
+import io
+import random
+import textwrap
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+TOPICS = {
+    "Photosynthesis": [
+        "chlorophyll", "light", "glucose", "carbon", "dioxide", "oxygen", "stroma",
+        "thylakoid", "calvin", "cycle", "energy", "plant", "leaf", "stomata",
+    ],
+    "Thermodynamics": [
+        "entropy", "enthalpy", "heat", "temperature", "pressure", "volume", "work",
+        "system", "equilibrium", "carnot", "engine", "isothermal", "adiabatic",
+    ],
+    "Linear Algebra": [
+        "matrix", "vector", "eigenvalue", "determinant", "basis", "span", "rank",
+        "kernel", "transformation", "orthogonal", "projection", "inverse",
+    ],
+    "World History": [
+        "empire", "revolution", "treaty", "dynasty", "trade", "colonial", "war",
+        "republic", "monarchy", "industrial", "reform", "migration", "culture",
+    ],
+}
+
+FILLER = [
+    "the", "of", "and", "is", "in", "which", "describes", "important", "process",
+    "because", "this", "that", "example", "students", "should", "remember", "how",
+]
+
+PAGE_SIZES = [1, 10, 100, 1000]
+
+
+def make_paragraph(rng, vocab, words):
+    tokens = [rng.choice(vocab) if rng.random() < 0.35 else rng.choice(FILLER) for _ in range(words)]
+    tokens[0] = tokens[0].capitalize()
+    return " ".join(tokens) + "."
+
+
+def make_pages(pages, words_per_page=450, paragraphs_per_page=4, seed=0):
+    """
+    Returns the study document as a list of page texts. The first page
+    starts with the title line, which recommend_videos uses as its query.
+    Paragraphs are separated by blank lines, like text extracted from a PDF.
+    """
+    rng = random.Random(seed * 100_003 + pages)
+    topic = rng.choice(sorted(TOPICS))
+    vocab = TOPICS[topic]
+    words = words_per_page // paragraphs_per_page
+
+    page_texts = []
+    for _ in range(pages):
+        page_texts.append("\n\n".join(make_paragraph(rng, vocab, words) for _ in range(paragraphs_per_page)))
+    page_texts[0] = f"{topic}: Study Notes ({pages} pages)\n\n{page_texts[0]}"
+    return page_texts
+
+
+def make_document(pages, words_per_page=450, paragraphs_per_page=4, seed=0):
+    """Returns the text of a study document with the given number of pages."""
+    return "\n\n".join(make_pages(pages, words_per_page, paragraphs_per_page, seed))
+
+
+def make_pdf(pages, seed=0):
+    """
+    Renders the same document to PDF bytes with reportlab, one corpus page
+    per PDF page, so uploads go through real PyPDF2 text extraction.
+    """
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+    for page_text in make_pages(pages, seed=seed):
+        c.setFont("Helvetica", 10)
+        y = height - 50
+        for paragraph in page_text.split("\n\n"):
+            for line in textwrap.wrap(paragraph, 100) + [""]:
+                if y < 50:
+                    c.showPage()
+                    c.setFont("Helvetica", 10)
+                    y = height - 50
+                c.drawString(40, y, line)
+                y -= 13
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
@@ -0,0 +1,373 @@
+"""
+Offline stand-ins for the external services StudySupport talks to:
+Gemini text generation, Gemini embeddings, Google Forms and YouTube Data.
+
+Every fake routes its calls through a FaultInjector, so a benchmark run can
+add network-like latency and random failures without touching the real APIs.
+"""
+
+import json
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+
+from langchain_core.embeddings import Embeddings
+
+
+class FakeServiceError(Exception):
+    """Raised by a fake service when the FaultInjector decides a call fails."""
+
+
+# ============================= FAULT INJECTION =============================
+class FaultInjector:
+    """
+    Adds latency and random failures to fake API calls and counts them.
+    latency and jitter are in seconds; error_rate is a probability in [0, 1].
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.calls = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._paused = 0
+
+    def __call__(self, name):
+        with self._lock:
+            if self._paused:
+                return
+            self.calls[name] += 1
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            fail = self._rng.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            raise FakeServiceError(f"{name}: injected failure")
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.calls)
+
+    @contextmanager
+    def paused(self):
+        """No latency, failures or counting inside the block (benchmark setup)."""
+        with self._lock:
+            self._paused += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._paused -= 1
+
+
+class _Request:
+    """Mimics the googleapiclient HttpRequest: nothing happens until execute()."""
+
+    def __init__(self, injector, name, handler):
+        self._injector = injector
+        self._name = name
+        self._handler = handler
+
+    def execute(self):
+        self._injector(self._name)
+        return self._handler()
+
+
+# ============================= GEMINI =============================
+class FakeGeminiResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """
+    Drop-in for genai.GenerativeModel. Recognises the prompts used by
+    qa_chain, quiz_generator and google_forms and answers in the format
+    each of them expects. noise is the share of quiz questions written in a
+    variant format and the chance a JSON answer is cut off, as real output
+    drifts from the requested format.
+    """
+
+    def __init__(self, injector, seed=0, json_fence=True, noise=0.0, chunk_size=64):
+        self.injector = injector
+        self.seed = seed
+        self.json_fence = json_fence
+        self.noise = noise
+        self.chunk_size = chunk_size
+
+    def generate_content(self, prompt, stream=False, generation_config=None):
+        self.injector("gemini.generate_content")
+        text = self._respond(prompt, generation_config or {})
+        if stream:
+            return [FakeGeminiResponse(text[i:i + self.chunk_size]) for i in range(0, len(text), self.chunk_size)]
+        return FakeGeminiResponse(text)
+
+    def _respond(self, prompt, generation_config):
+        rng = random.Random(zlib.crc32(prompt.encode("utf-8")) ^ self.seed)
+        if "quiz master" in prompt:
+            match = re.search(r"Create (\d+) multiple-choice", prompt)
+            return make_mcq_text(int(match.group(1)) if match else 5, rng, self.noise)
+        if "Output only valid JSON" in prompt:
+            match = re.search(r"Generate (\d+)", prompt)
+            payload = make_form_json(int(match.group(1)) if match else 5, rng)
+            if rng.random() < self.noise:
+                # Hit the output token limit part-way through the last item
+                payload = payload[:int(len(payload) * 0.97)]
+            if generation_config.get("response_mime_type") != "application/json" and self.json_fence:
+                # Without structured output Gemini usually wraps JSON in a markdown fence
+                payload = f"Here are your questions:\n```json\n{payload}\n```"
+            return payload
+        return make_answer_text(prompt, rng)
+
+
+_WORDS = re.compile(r"[a-z]{4,}")
+
+
+def make_answer_text(prompt, rng):
+    words = _WORDS.findall(prompt.lower())
+    picked = rng.sample(words, min(len(words), 30)) if words else ["unknown"]
+    return "Based on the context, " + " ".join(picked) + "."
+
+
+MCQ_VARIANTS = ["markdown", "paren_options", "no_explanation", "three_options", "wrapped_question"]
+
+
+def make_mcq_text(num_questions, rng, noise=0.0):
+    """
+    Quiz text in the 'Q1. / A. / Answer: / Explanation:' format. With noise,
+    that share of questions uses one of MCQ_VARIANTS instead.
+    """
+    blocks = []
+    for i in range(1, num_questions + 1):
+        variant = rng.choice(MCQ_VARIANTS) if rng.random() < noise else None
+        letters = "ABC" if variant == "three_options" else "ABCD"
+        answer = rng.choice(letters)
+        question = f"Which statement about concept {rng.randint(1, 999)} is correct?"
+        sep = ")" if variant == "paren_options" else "."
+
+        if variant == "markdown":
+            lines = [f"**Q{i}.** {question}"]
+        elif variant == "wrapped_question":
+            lines = [f"Q{i}. Consider the passage above.", question]
+        else:
+            lines = [f"Q{i}. {question}"]
+        lines.extend(f"{letter}{sep} Option {letter} for question {i}" for letter in letters)
+        if variant == "markdown":
+            lines.append(f"**Answer:** {answer}")
+        elif variant == "paren_options":
+            lines.append(f"Answer: {answer}) Option {answer} for question {i}")
+        else:
+            lines.append(f"Answer: {answer}")
+        if variant != "no_explanation":
+            lines.append(f"Explanation: Option {answer} matches the definition in the text.")
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+def make_form_json(num_questions, rng):
+    questions = []
+    for i in range(1, num_questions + 1):
+        options = [f"Choice {letter}{i}" for letter in "ABCD"]
+        questions.append({
+            "question": f"Question {i} about topic {rng.randint(1, 999)}?",
+            "options": options,
+            "answer": rng.choice(options),
+        })
+    return json.dumps({"questions": questions}, indent=2)
+
+
+# ============================= EMBEDDINGS =============================
+class FakeEmbeddings(Embeddings):
+    """
+    Deterministic hashed bag-of-words embeddings. Similar texts get similar
+    vectors, so FAISS similarity search behaves sensibly, but nothing leaves
+    the machine.
+    """
+
+    def __init__(self, injector, dim=256, batch_size=100):
+        self.injector = injector
+        self.dim = dim
+        self.batch_size = batch_size
+
+    def _embed(self, text):
+        vec = [0.0] * self.dim
+        for word in _WORDS.findall(text.lower()):
+            vec[zlib.crc32(word.encode("utf-8")) % self.dim] += 1.0
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        return [v / norm for v in vec]
+
+    def embed_documents(self, texts):
+        vectors = []
+        # The real endpoint takes batches of at most 100 texts per request
+        for start in range(0, len(texts), self.batch_size):
+            self.injector("embeddings.batch_embed")
+            vectors.extend(self._embed(t) for t in texts[start:start + self.batch_size])
+        return vectors
+
+    def embed_query(self, text):
+        self.injector("embeddings.embed_query")
+        return self._embed(text)
+
+
+# ============================= GOOGLE FORMS =============================
+class FakeFormsService:
+    """
+    In-memory Forms API v1 covering the calls made by google_forms.py:
+    forms().create / batchUpdate / get and forms().responses().list.
+    Each form receives responses_per_form synthetic submissions.
+    """
+
+    def __init__(self, injector, responses_per_form=30, seed=0):
+        self.injector = injector
+        self.responses_per_form = responses_per_form
+        self.forms_by_id = {}
+        self._rng = random.Random(seed)
+
+    def forms(self):
+        return _FormsResource(self)
+
+    def _create(self, body):
+        form_id = f"form{len(self.forms_by_id) + 1}"
+        self.forms_by_id[form_id] = {"formId": form_id, "info": body.get("info", {}), "items": []}
+        return {"formId": form_id}
+
+    def _batch_update(self, form_id, body):
+        items = self.forms_by_id[form_id]["items"]
+        for req in body.get("requests", []):
+            create = req["createItem"]
+            item = json.loads(json.dumps(create["item"]))
+            question = item.get("questionItem", {}).get("question")
+            if question is not None:
+                question["questionId"] = f"{zlib.crc32(item['title'].encode('utf-8')):08x}"
+            items.insert(create["location"]["index"], item)
+        return {"replies": [{} for _ in body.get("requests", [])]}
+
+    def _responses(self, form_id):
+        items = self.forms_by_id[form_id]["items"]
+        responses = []
+        for n in range(self.responses_per_form):
+            answers = {}
+            for item in items:
+                question = item.get("questionItem", {}).get("question", {})
+                qid = question.get("questionId")
+                if not qid:
+                    continue
+                title = item.get("title", "").lower()
+                if "name" in title:
+                    value = f"Student {n}"
+                elif "email" in title:
+                    value = f"student{n}@example.com"
+                elif "choiceQuestion" in question:
+                    value = self._rng.choice(question["choiceQuestion"]["options"])["value"]
+                else:
+                    value = f"free text answer {n}"
+                answers[qid] = {"questionId": qid, "textAnswers": {"answers": [{"value": value}]}}
+            responses.append({"responseId": f"{form_id}-r{n}", "answers": answers})
+        return {"responses": responses}
+
+
+class _FormsResource:
+    def __init__(self, service):
+        self._service = service
+
+    def _request(self, name, handler):
+        return _Request(self._service.injector, f"forms.{name}", handler)
+
+    def create(self, body):
+        return self._request("create", lambda: self._service._create(body))
+
+    def batchUpdate(self, formId, body):
+        return self._request("batchUpdate", lambda: self._service._batch_update(formId, body))
+
+    def get(self, formId):
+        return self._request("get", lambda: json.loads(json.dumps(self._service.forms_by_id[formId])))
+
+    def responses(self):
+        return _FormResponsesResource(self)
+
+
+class _FormResponsesResource:
+    def __init__(self, forms):
+        self._forms = forms
+
+    def list(self, formId):
+        return self._forms._request("responses.list", lambda: self._forms._service._responses(formId))
+
+
+# ============================= YOUTUBE =============================
+class FakeYouTubeService:
+    """In-memory YouTube Data API v3 covering search().list and videos().list."""
+
+    def __init__(self, injector, seed=0):
+        self.injector = injector
+        self.seed = seed
+
+    def search(self):
+        return _YouTubeSearchResource(self)
+
+    def videos(self):
+        return _YouTubeVideosResource(self)
+
+    def _search(self, q, maxResults=5, **kwargs):
+        rng = random.Random(zlib.crc32(q.encode("utf-8")) ^ self.seed)
+        items = []
+        for i in range(maxResults):
+            video_id = f"vid{rng.randrange(16 ** 8):08x}"
+            items.append({
+                "id": {"kind": "youtube#video", "videoId": video_id},
+                "snippet": {"title": f"{q[:40]} - lecture {i + 1}"},
+            })
+        return {"items": items}
+
+    def _videos(self, id, **kwargs):
+        items = []
+        for video_id in id.split(","):
+            rng = random.Random(zlib.crc32(video_id.encode("utf-8")))
+            items.append({
+                "id": video_id,
+                "snippet": {"title": f"Video {video_id}"},
+                "statistics": {
+                    "viewCount": str(rng.randint(100, 5_000_000)),
+                    "likeCount": str(rng.randint(0, 100_000)),
+                },
+            })
+        return {"items": items}
+
+
+class _YouTubeSearchResource:
+    def __init__(self, service):
+        self._service = service
+
+    def list(self, **kwargs):
+        return _Request(self._service.injector, "youtube.search.list", lambda: self._service._search(**kwargs))
+
+
+class _YouTubeVideosResource:
+    def __init__(self, service):
+        self._service = service
+
+    def list(self, **kwargs):
+        return _Request(self._service.injector, "youtube.videos.list", lambda: self._service._videos(**kwargs))
+
+
+def make_build(injector, responses_per_form=30, seed=0):
+    """
+    Returns a replacement for googleapiclient.discovery.build that hands out
+    the fake Forms and YouTube services.
+    """
+
+    def build(service_name, version, **kwargs):
+        if service_name == "forms":
+            return FakeFormsService(injector, responses_per_form=responses_per_form, seed=seed)
+        if service_name == "youtube":
+            return FakeYouTubeService(injector, seed=seed)
+        raise ValueError(f"No offline fake for Google API '{service_name}'")
+
+    return build
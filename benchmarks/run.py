@@ -0,0 +1,420 @@
+"""
+Offline end-to-end benchmarks for StudySupport.
+
+Runs the same backend calls the Streamlit pages make (upload, Q&A, quiz,
+Google Form export, YouTube recommendations) against the fakes in
+benchmarks/fakes.py and writes timings to JSON so two commits can be compared.
+
+Usage (from the repository root):
+    python -m benchmarks.run --output before.json
+    python -m benchmarks.run --output after.json --compare before.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from benchmarks.corpus import PAGE_SIZES, make_document, make_pdf
+from benchmarks.fakes import (
+    FakeEmbeddings,
+    FakeGeminiModel,
+    FakeServiceError,
+    FaultInjector,
+    make_build,
+    make_form_json,
+    make_mcq_text,
+)
+
+SCENARIOS = ["upload", "qa", "quiz", "form_export", "recommendations", "parse_mcq", "parse_mcq_stream", "parse_json"]
+
+# The parse scenarios treat one page of LLM output as this many questions
+QUESTIONS_PER_PAGE = 10
+
+
+# ============================= FAKE WIRING =============================
+def install_fakes(injector, responses_per_form=30, seed=0, noise=0.0):
+    """
+    Imports the app modules with dummy keys and swaps every external client
+    for its offline fake. Returns the patched modules by name.
+    """
+    # The modules read their keys and configure Gemini at import time.
+    # Dummy keys keep quiz_generator's key check happy and make sure a real
+    # key from .env is never used (load_dotenv does not override these).
+    os.environ["GEMINI_API_KEY"] = "AIza-offline-benchmark"
+    os.environ["YOUTUBE_API_KEY"] = "offline-benchmark"
+
+    from backend import llm_parser, pdf_loader, qa_chain, quiz_generator, vector_store, youtube_recommender
+    import google_forms
+
+    model = FakeGeminiModel(injector, seed=seed, noise=noise)
+    embeddings = FakeEmbeddings(injector)
+    build = make_build(injector, responses_per_form=responses_per_form, seed=seed)
+
+    qa_chain.model = model
+    quiz_generator.model = model
+    google_forms.model = model
+    vector_store.GoogleGenerativeAIEmbeddings = lambda **kwargs: embeddings
+    youtube_recommender.YOUTUBE_API_KEY = os.environ["YOUTUBE_API_KEY"]
+    youtube_recommender.build = build
+    google_forms.build = build
+    google_forms.authenticate_google = lambda: build("forms", "v1")
+
+    return {
+        "llm_parser": llm_parser,
+        "pdf_loader": pdf_loader,
+        "qa_chain": qa_chain,
+        "quiz_generator": quiz_generator,
+        "vector_store": vector_store,
+        "youtube_recommender": youtube_recommender,
+        "google_forms": google_forms,
+    }
+
+
+# ============================= SCENARIOS =============================
+class BenchContext:
+    """Shared state for one benchmark run: patched modules, corpora and FAISS dirs."""
+
+    def __init__(self, modules, workdir, num_questions=5, seed=0, noise=0.0):
+        self.m = modules
+        self.workdir = workdir
+        self.num_questions = num_questions
+        self.seed = seed
+        self.noise = noise
+        self._docs = {}
+        self._pdfs = {}
+        self._stores = set()
+
+    def document(self, pages):
+        if pages not in self._docs:
+            self._docs[pages] = make_document(pages, seed=self.seed)
+        return self._docs[pages]
+
+    def pdf(self, pages):
+        if pages not in self._pdfs:
+            self._pdfs[pages] = make_pdf(pages, seed=self.seed)
+        return self._pdfs[pages]
+
+    def db_path(self, pages):
+        return os.path.join(self.workdir, f"db_{pages}")
+
+    def ensure_store(self, pages):
+        if pages not in self._stores:
+            self.m["vector_store"].create_vector_store(self.document(pages), self.db_path(pages))
+            self._stores.add(pages)
+        return self.db_path(pages)
+
+
+def scenario_upload(ctx, pages):
+    data = ctx.pdf(pages)
+
+    def run():
+        uploaded = io.BytesIO(data)
+        uploaded.name = "notes.pdf"
+        raw_text = ctx.m["pdf_loader"].load_pdf_text(uploaded)
+        ctx.m["vector_store"].create_vector_store(raw_text, ctx.db_path(pages))
+        return {"chars": len(raw_text), "pdf_bytes": len(data)}
+
+    return run
+
+
+def scenario_qa(ctx, pages):
+    path = ctx.ensure_store(pages)
+
+    def run():
+        db = ctx.m["vector_store"].load_vector_store(path)
+        docs = db.similarity_search("What is the most important process?", k=3)
+        context = "\n\n".join([doc.page_content for doc in docs])
+        answer = ctx.m["qa_chain"].ask_question(context, "What is the most important process?")
+        return {"answer_chars": len(answer)}
+
+    return run
+
+
+def scenario_quiz(ctx, pages):
+    path = ctx.ensure_store(pages)
+    quiz = ctx.m["quiz_generator"]
+
+    def run():
+        db = ctx.m["vector_store"].load_vector_store(path)
+        docs = db.similarity_search("generate quiz", k=5)
+        context = "\n\n".join([d.page_content for d in docs])
+        parser = ctx.m["llm_parser"].MCQStreamParser()
+        questions = list(quiz.stream_mcq_quiz(context, "basic", ctx.num_questions, parser=parser))
+        return {
+            "questions_requested": ctx.num_questions,
+            "questions_parsed": len(questions),
+            "questions_rejected": len(parser.rejected),
+        }
+
+    return run
+
+
+def scenario_form_export(ctx, pages):
+    raw_text = ctx.document(pages)
+    forms = ctx.m["google_forms"]
+
+    def run():
+        service = forms.authenticate_google()
+        questions = forms.generate_questions(raw_text, ctx.num_questions, "MCQ")
+        if questions is None:
+            raise FakeServiceError("generate_questions returned no questions")
+        form_id, _ = forms.create_form(service, "Benchmark Form", questions, "MCQ")
+        df = forms.download_responses(service, form_id, questions, "MCQ")
+        return {"questions_parsed": len(questions["questions"]), "responses": len(df)}
+
+    return run
+
+
+def scenario_recommendations(ctx, pages):
+    raw_text = ctx.document(pages)
+
+    def run():
+        videos = ctx.m["youtube_recommender"].recommend_videos(raw_text)
+        return {"videos": len(videos)}
+
+    return run
+
+
+def scenario_parse_mcq(ctx, pages):
+    requested = pages * QUESTIONS_PER_PAGE
+    quiz_text = make_mcq_text(requested, random.Random(ctx.seed), ctx.noise)
+    quiz = ctx.m["quiz_generator"]
+
+    def run():
+        questions = quiz.parse_mcq_output(quiz_text)
+        return {"questions_requested": requested, "questions_parsed": len(questions), "chars": len(quiz_text)}
+
+    return run
+
+
+def scenario_parse_mcq_stream(ctx, pages):
+    requested = pages * QUESTIONS_PER_PAGE
+    quiz_text = make_mcq_text(requested, random.Random(ctx.seed), ctx.noise)
+    # Roughly the chunk size Gemini streams in
+    chunks = [quiz_text[i:i + 64] for i in range(0, len(quiz_text), 64)]
+    parser = ctx.m["llm_parser"]
+
+    def run():
+        parsed = sum(1 for _ in parser.parse_mcq_stream(chunks))
+        return {"questions_requested": requested, "questions_parsed": parsed, "chunks": len(chunks)}
+
+    return run
+
+
+def scenario_parse_json(ctx, pages):
+    requested = pages * QUESTIONS_PER_PAGE
+    payload = make_form_json(requested, random.Random(ctx.seed))
+    if ctx.noise:
+        # Truncated mid-item and fenced, so the repair path is measured
+        payload = f"```json\n{payload[:int(len(payload) * 0.999)]}"
+    parser = ctx.m["llm_parser"]
+
+    def run():
+        result = parser.parse_json_questions(payload)
+        return {
+            "questions_requested": requested,
+            "questions_parsed": len(result["questions"]),
+            "questions_rejected": len(result["rejected"]),
+            "chars": len(payload),
+        }
+
+    return run
+
+
+SCENARIO_FUNCS = {
+    "upload": scenario_upload,
+    "qa": scenario_qa,
+    "quiz": scenario_quiz,
+    "form_export": scenario_form_export,
+    "recommendations": scenario_recommendations,
+    "parse_mcq": scenario_parse_mcq,
+    "parse_mcq_stream": scenario_parse_mcq_stream,
+    "parse_json": scenario_parse_json,
+}
+
+
+# ============================= TIMING =============================
+def summarize(times):
+    if not times:
+        return None
+    ordered = sorted(times)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "runs": len(times),
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "mean": statistics.fmean(ordered),
+        "p95": p95,
+        "stdev": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+    }
+
+
+def run_case(ctx, injector, scenario, pages, repeat):
+    # Setup (building the FAISS store for qa/quiz, rendering the PDF) is not
+    # what is being measured, so it runs without injected latency or failures
+    with injector.paused():
+        run = SCENARIO_FUNCS[scenario](ctx, pages)
+    times, errors, extra = [], [], {}
+    calls_before = injector.snapshot()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            extra = run()
+        except FakeServiceError as exc:
+            errors.append(str(exc))
+            continue
+        times.append(time.perf_counter() - start)
+    calls_after = injector.snapshot()
+    api_calls = {
+        name: (count - calls_before.get(name, 0)) / repeat
+        for name, count in calls_after.items()
+        if count != calls_before.get(name, 0)
+    }
+    return {
+        "scenario": scenario,
+        "pages": pages,
+        "stats": summarize(times),
+        "errors": len(errors),
+        "error_samples": errors[:3],
+        "api_calls_per_run": api_calls,
+        "extra": extra,
+    }
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ============================= COMPARISON =============================
+def compare_results(baseline, current, threshold):
+    """
+    Compares median timings case by case. Returns (lines, regressions) where
+    a regression is a case whose median grew by more than threshold.
+    """
+    old = {(r["scenario"], r["pages"]): r for r in baseline["results"]}
+    lines, regressions = [], []
+    for r in current["results"]:
+        key = (r["scenario"], r["pages"])
+        before = old.get(key)
+        if not before or not before["stats"] or not r["stats"]:
+            lines.append(f"{key[0]:<16}{key[1]:>6}   (no baseline)")
+            continue
+        a, b = before["stats"]["median"], r["stats"]["median"]
+        ratio = b / a if a else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        elif ratio < 1 - threshold:
+            flag = "  improved"
+        lines.append(f"{key[0]:<16}{key[1]:>6}   {a * 1000:10.2f} ms -> {b * 1000:10.2f} ms   x{ratio:5.2f}{flag}")
+    return lines, regressions
+
+
+# ============================= MAIN =============================
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline StudySupport benchmarks")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"comma-separated subset of {','.join(SCENARIOS)}")
+    parser.add_argument("--pages", default=",".join(str(p) for p in PAGE_SIZES),
+                        help="comma-separated document sizes in pages (1-1000)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case")
+    parser.add_argument("--questions", type=int, default=5, help="questions per quiz/form")
+    parser.add_argument("--responses", type=int, default=30, help="synthetic responses per Google Form")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added latency per fake API call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random extra latency per fake API call")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability a fake API call fails")
+    parser.add_argument("--noise", type=float, default=0.0,
+                        help="share of LLM output written in a variant or truncated format")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--compare", help="baseline JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative median slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    args.scenarios = [s for s in args.scenarios.split(",") if s]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    args.pages = [int(p) for p in args.pages.split(",") if p]
+    if any(p < 1 or p > 1000 for p in args.pages):
+        parser.error("--pages values must be between 1 and 1000")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    injector = FaultInjector(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    modules = install_fakes(injector, responses_per_form=args.responses, seed=args.seed, noise=args.noise)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="studysupport-bench-") as workdir:
+        ctx = BenchContext(modules, workdir, num_questions=args.questions, seed=args.seed, noise=args.noise)
+        for scenario in args.scenarios:
+            for pages in args.pages:
+                result = run_case(ctx, injector, scenario, pages, args.repeat)
+                results.append(result)
+                median = result["stats"]["median"] * 1000 if result["stats"] else float("nan")
+                print(f"{scenario:<16}{pages:>6} pages   median {median:10.2f} ms   errors {result['errors']}",
+                      file=sys.stderr)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {
+                "repeat": args.repeat,
+                "questions": args.questions,
+                "responses": args.responses,
+                "latency_ms": args.latency_ms,
+                "jitter_ms": args.jitter_ms,
+                "error_rate": args.error_rate,
+                "noise": args.noise,
+                "seed": args.seed,
+            },
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        lines, regressions = compare_results(baseline, report, args.threshold)
+        print("\n".join(lines), file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,6 @@
 import streamlit as st
 import os
-import json
 import time
-import re
 import pandas as pd
 
 from google.oauth2 import service_account
@@ -10,6 +8,8 @@ from googleapiclient.discovery import build
 import google.generativeai as genai
 from dotenv import load_dotenv
 
+from backend.llm_parser import QUESTIONS_SCHEMA, parse_json_questions
+
 # ============================= CONFIG =============================
 load_dotenv()
 
@@ -32,15 +32,15 @@ def authenticate_google():
     return service
 
 # ============================= SAFE PARSE =============================
-def safe_parse_gemini_json(response_text):
-    try:
-        return json.loads(response_text)
-    except:
-        json_text = re.search(r'\{.*\}', response_text, re.DOTALL)
-        if json_text:
-            return json.loads(json_text.group())
-        st.error("⚠ Gemini returned invalid JSON.")
+def safe_parse_gemini_json(response_text, q_type="MCQ"):
+    parsed = parse_json_questions(response_text, mcq=q_type == "MCQ")
+    rejected = len(parsed.pop("rejected"))
+    if not parsed["questions"]:
+        st.error(f"⚠ Gemini returned no usable questions ({rejected} rejected).")
         return None
+    if rejected:
+        st.warning(f"⚠ Skipped {rejected} incomplete question(s) from Gemini.")
+    return parsed
 
 # ============================= GENERATE QUESTIONS =============================
 def generate_questions(text, num_questions, q_type):
@@ -55,8 +55,12 @@ Generate {num_questions} {q_type} questions from the following text. Output only
 
 Text: {text}
 """
-    response = model.generate_content(prompt)
-    return safe_parse_gemini_json(response.text)
+    # Structured output: Gemini returns JSON matching the schema, no fences
+    response = model.generate_content(
+        prompt,
+        generation_config={"response_mime_type": "application/json", "response_schema": QUESTIONS_SCHEMA}
+    )
+    return safe_parse_gemini_json(response.text, q_type)
 
 # ============================= CREATE FORM =============================
 def create_form(service, form_title, questions, q_type):
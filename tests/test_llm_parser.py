@@ -0,0 +1,190 @@
+import json
+
+import pytest
+
+from backend.llm_parser import (
+    MCQStreamParser,
+    parse_json_questions,
+    parse_json_stream,
+    parse_mcq_stream,
+    parse_mcq_text,
+    repair_json,
+)
+
+VARIANT_QUIZ = """Here is your quiz:
+
+**Q1.** What is the powerhouse
+of the cell?
+A) Nucleus
+B) Mitochondria
+C) Ribosome
+**Answer:** B) Mitochondria
+**Explanation:** It makes ATP.
+
+Question 2: Which gas do plants release?
+(A) Oxygen
+(B) Nitrogen
+(C) Carbon dioxide
+(D) Helium
+(E) Neon
+Correct answer - A
+
+### Q3. Only one option
+A. only
+Answer: A
+"""
+
+
+def make_payload(n=5):
+    return json.dumps({"questions": [
+        {"question": f"Question {i}?", "options": [f"Choice {c}{i}" for c in "ABCD"], "answer": f"Choice B{i}"}
+        for i in range(1, n + 1)
+    ]}, indent=2)
+
+
+# ============================= MCQ TEXT =============================
+def test_variant_mcq_formats():
+    parser = MCQStreamParser()
+    questions = parser.feed(VARIANT_QUIZ) + parser.close()
+
+    assert [q["question"] for q in questions] == ["What is the powerhouse of the cell?", "Which gas do plants release?"]
+    assert questions[0]["options"] == {"A": "Nucleus", "B": "Mitochondria", "C": "Ribosome"}
+    assert questions[0]["answer"] == "B"
+    assert questions[0]["explanation"] == "It makes ATP."
+    assert len(questions[1]["options"]) == 5
+    assert questions[1]["answer"] == "A"
+    assert questions[1]["explanation"] == ""
+    assert [q["question"] for q in parser.rejected] == ["Only one option"]
+
+
+def test_bare_letter_answer_wins_over_option_text():
+    text = "Q1. Universal donor blood type?\nA. O\nB. AB\nC. A\nD. B\nAnswer: B\nExplanation: AB is wrong, but B is the letter."
+    assert parse_mcq_text(text)[0]["answer"] == "B"
+
+
+def test_answer_given_as_option_text():
+    text = "Q1. Largest planet?\nA. Mars\nB. Jupiter\nAnswer: jupiter"
+    assert parse_mcq_text(text)[0]["answer"] == "B"
+
+
+def test_numbered_explanation_stays_in_explanation():
+    text = (
+        "Q1. How do you boil water?\nA. Heat it\nB. Freeze it\nAnswer: A\n"
+        "Explanation: Steps:\n1) do this\n2) that\n"
+        "Q2. Next?\nA. x\nB. y\nAnswer: B\nExplanation: Because."
+    )
+    parser = MCQStreamParser()
+    questions = parser.feed(text) + parser.close()
+
+    assert len(questions) == 2
+    assert questions[0]["explanation"] == "Steps: 1) do this 2) that"
+    assert parser.rejected == []
+
+
+def test_numbered_list_in_stem_stays_in_question():
+    text = (
+        "Q1. Arrange the planets by distance from the Sun:\n1. Earth\n2. Mercury\n3. Venus\n"
+        "A. 2, 3, 1\nB. 1, 2, 3\nC. 3, 1, 2\nAnswer: A\nExplanation: Mercury is closest.\n"
+        "Q2. Next?\nA. x\nB. y\nAnswer: B"
+    )
+    parser = MCQStreamParser()
+    questions = parser.feed(text) + parser.close()
+
+    assert questions[0]["question"] == "Arrange the planets by distance from the Sun: 1. Earth 2. Mercury 3. Venus"
+    assert questions[0]["options"]["A"] == "2, 3, 1"
+    assert questions[0]["answer"] == "A"
+    assert [q["question"] for q in questions] == [questions[0]["question"], "Next?"]
+    assert parser.rejected == []
+
+
+def test_lowercase_options_and_answer():
+    questions = parse_mcq_text("Q1. What?\na) x\nb) y\nAnswer: b")
+    assert questions[0]["options"] == {"A": "x", "B": "y"}
+    assert questions[0]["answer"] == "B"
+
+
+def test_abbreviation_in_stem_is_not_an_option():
+    questions = parse_mcq_text("Q1. Name a noble gas,\ne.g. one used in signs.\nA. Neon\nB. Iron\nAnswer: A")
+    assert questions[0]["question"] == "Name a noble gas, e.g. one used in signs."
+    assert list(questions[0]["options"]) == ["A", "B"]
+
+
+def test_answer_starting_with_word_a_is_not_option_a():
+    text = "Q1. What is Sirius?\nA. A planet\nB. A moon\nAnswer: A bright star"
+    parser = MCQStreamParser()
+    assert parser.feed(text) + parser.close() == []
+    assert len(parser.rejected) == 1
+
+
+def test_bare_numbered_questions_after_explanation():
+    text = "1. First?\nA. a\nB. b\nAnswer: A\nExplanation: One.\n2. Second?\nA. a\nB. b\nAnswer: B\nExplanation: Two."
+    assert [q["question"] for q in parse_mcq_text(text)] == ["First?", "Second?"]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+def test_mcq_stream_matches_full_parse(size):
+    chunks = [VARIANT_QUIZ[i:i + size] for i in range(0, len(VARIANT_QUIZ), size)]
+    assert list(parse_mcq_stream(chunks)) == parse_mcq_text(VARIANT_QUIZ)
+
+
+# ============================= JSON QUESTIONS =============================
+def test_json_in_fence_with_prose():
+    result = parse_json_questions("Sure!\n```json\n" + make_payload(3) + "\n```")
+    assert len(result["questions"]) == 3
+    assert result["rejected"] == []
+
+
+@pytest.mark.parametrize("answer", ["B", "b", "b)"])
+def test_json_letter_answer_maps_to_option_text(answer):
+    payload = json.dumps({"questions": [{"question": "Q?", "options": ["x", "y"], "answer": answer}]})
+    assert parse_json_questions(payload)["questions"][0]["answer"] == "y"
+
+
+def test_json_after_bracketed_prose():
+    result = parse_json_questions("Here are [2] questions:\n```json\n" + make_payload(2) + "\n```")
+    assert [q["question"] for q in result["questions"]] == ["Question 1?", "Question 2?"]
+    assert result["rejected"] == []
+
+
+@pytest.mark.parametrize("fraction", [0.97, 0.95, 0.93, 0.90, 0.80, 0.50])
+def test_truncated_json_never_keeps_partial_items(fraction):
+    payload = make_payload(5)
+    full = {q["question"]: q for q in json.loads(payload)["questions"]}
+    result = parse_json_questions(payload[:int(len(payload) * fraction)])
+
+    assert result["questions"]
+    for q in result["questions"]:
+        # Every kept question is exactly as Gemini meant it
+        assert q == full[q["question"]]
+    assert len(result["questions"]) + len(result["rejected"]) <= 5
+
+
+def test_truncated_item_is_rejected_not_kept():
+    payload = make_payload(5)
+    cut = payload.index('"Choice D5"') + 8
+    result = parse_json_questions(payload[:cut])
+
+    assert [q["question"] for q in result["questions"]] == [f"Question {i}?" for i in range(1, 5)]
+    assert len(result["rejected"]) == 1
+
+
+def test_text_questions_do_not_need_options():
+    payload = json.dumps({"questions": [{"question": "Define osmosis.", "answer": "Diffusion of water"}]})
+    assert parse_json_questions(payload)["questions"] == []
+    assert len(parse_json_questions(payload, mcq=False)["questions"]) == 1
+
+
+def test_repair_json_drops_unfinished_string():
+    assert repair_json('{"question": "Q?", "options": ["a", "b", "Choi') == {"question": "Q?", "options": ["a", "b"]}
+    assert repair_json('{"question": "Q?", "answ') == {"question": "Q?"}
+
+
+@pytest.mark.parametrize("size", [1, 3, 16])
+def test_json_stream_splits_tokens(size):
+    payload = "```json\n" + make_payload(4).replace("Question 2?", 'Question \\"2\\"?') + "\n```"
+    chunks = [payload[i:i + size] for i in range(0, len(payload), size)]
+    questions = list(parse_json_stream(chunks))
+
+    assert len(questions) == 4
+    assert questions[1]["question"] == 'Question "2"?'
+    assert questions == parse_json_questions(payload)["questions"]